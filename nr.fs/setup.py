@@ -15,6 +15,7 @@ setuptools.setup(
   long_description_content_type = 'text/markdown',
   url = 'https://github.com/NiklasRosenstein/python-nr/tree/master/nr.fs',
   license = 'MIT',
+  python_requires = '>=3.6',
   packages = setuptools.find_packages('src'),
   package_dir = {'': 'src'},
   namespace_packages = ['nr'],
@@ -34,15 +34,18 @@ __all__ = [
   'canonical', 'abs', 'rel', 'isfile_cs', 'isrel', 'issub', 'isglob', 'glob', 'addtobase',
   'addprefix', 'addsuffix', 'setsuffix', 'rmvsuffix', 'getsuffix', 'makedirs',
   'chmod_update', 'chmod_repr', 'chmod', 'compare_timestamp',
-  'compare_all_timestamps', 'fixcase',
+  'compare_all_timestamps', 'fixcase', 'invalidate_fixcase_cache',
+  'listdir_stat',
 ]
 
 import ctypes
 import errno
+import fnmatch
 import functools
 import operator
 import os
 import platform
+import re
 import stat as _stat
 
 from os import (
@@ -78,6 +81,14 @@ except ImportError as exc:
 
 is_case_sensitive = not (os.name == 'nt' or 'windows' in platform.platform().lower())
 
+if os.name == 'nt':
+  # Use a private handle so that setting the prototype does not affect
+  # other users of ctypes.windll.kernel32.
+  _kernel32 = ctypes.WinDLL('kernel32')
+  _GetLongPathNameW = _kernel32.GetLongPathNameW
+  _GetLongPathNameW.argtypes = [ctypes.c_wchar_p, ctypes.c_wchar_p, ctypes.c_uint32]
+  _GetLongPathNameW.restype = ctypes.c_uint32
+
 
 def canonical(path, parent=None):
   """
@@ -128,14 +139,30 @@ def isfile_cs(path):
   exact case-sensitive path points to an existing file.
   """
 
+  return _isfile_cs(path)
+
+
+def _isfile_cs_nt(path):
   if not os.path.isfile(path):
     return False
-  if os.name == 'nt':
-    return os.path.basename(path) == os.path.basename(fixcase(path))
-  elif not is_case_sensitive:
-    dirname, filename = split(path)
-    return filename in os.listdir(dirname)
-  return True
+  # Bypass the cache, it would not reflect case-only renames.
+  return os.path.basename(path) == os.path.basename(_fixcase(path))
+
+
+def _isfile_cs_listdir(path):
+  if not os.path.isfile(path):
+    return False
+  dirname, filename = split(path)
+  return filename in os.listdir(dirname)
+
+
+# The implementation of #isfile_cs() is selected once for the platform.
+if os.name == 'nt':
+  _isfile_cs = _isfile_cs_nt
+elif not is_case_sensitive:
+  _isfile_cs = _isfile_cs_listdir
+else:
+  _isfile_cs = os.path.isfile
 
 
 def isrel(path):
@@ -167,14 +194,15 @@ def isglob(path):
   Checks if *path* is a glob pattern. Returns #True if it is, #False if not.
   """
 
-  return '*' in path or '?' in path
+  return '*' in path or '?' in path or '[' in path
 
 
 def glob(patterns, parent=None, excludes=None, include_dotfiles=False,
          ignore_false_excludes=False):
   """
-  Wrapper for #glob2.glob() that accepts an arbitrary number of
-  patterns and matches them. The paths are normalized with #norm().
+  Matches an arbitrary number of glob patterns. The paths are normalized
+  with #norm(). Recursive patterns (containing `**`) are delegated to
+  #glob2.glob().
 
   Relative patterns are automaticlly joined with *parent*. If the
   parameter is omitted, it defaults to the current working directory.
@@ -202,9 +230,6 @@ def glob(patterns, parent=None, excludes=None, include_dotfiles=False,
   list of str: A list of filenames.
   """
 
-  if not glob2:
-    raise glob2_exc
-
   if isinstance(patterns, str):
     patterns = [patterns]
 
@@ -213,22 +238,27 @@ def glob(patterns, parent=None, excludes=None, include_dotfiles=False,
 
   result = []
   for pattern in patterns:
-    if not os.path.isabs(pattern):
-      pattern = os.path.join(parent, pattern)
-    result += glob2.glob(canonical(pattern))
+    pattern = _canonical_glob(pattern, parent)
+    if not isglob(pattern):
+      if os.path.lexists(pattern):
+        result.append(pattern)
+    else:
+      result += _glob(pattern, include_dotfiles)
 
   for pattern in (excludes or ()):
-    if not os.path.isabs(pattern):
-      pattern = os.path.join(parent, pattern)
-    pattern = canonical(pattern)
-    if not isglob(pattern):
+    pattern = _canonical_glob(pattern, parent)
+    literal = not isglob(pattern)
+    if not literal and os.path.lexists(pattern):
+      # A file whose name contains wildcard characters.
+      pattern, literal = canonical(pattern), True
+    if literal:
       try:
         result.remove(pattern)
       except ValueError as exc:
         if not ignore_false_excludes:
           raise ValueError('{} ({})'.format(exc, pattern))
     else:
-      for item in glob2.glob(pattern):
+      for item in _glob(pattern, include_dotfiles):
         try:
           result.remove(item)
         except ValueError as exc:
@@ -238,6 +268,85 @@ def glob(patterns, parent=None, excludes=None, include_dotfiles=False,
   return result
 
 
+def _canonical_glob(pattern, parent):
+  """
+  Like #canonical(), but does not attempt to fix the case of *pattern* if
+  it contains wildcards. Patterns usually do not exist as files, thus
+  #fixcase() would return them unchanged anyway.
+  """
+
+  pattern = norm(abs(pattern, parent))
+  if not is_case_sensitive and not isglob(pattern):
+    pattern = fixcase(pattern)
+  return pattern
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_glob(pattern, include_dotfiles=False):
+  """
+  Compiles the normalized, absolute glob *pattern*. Returns a tuple of the
+  longest literal parent directory, a tuple of `(name, match)` pairs for the
+  remaining path elements and a boolean that indicates whether the pattern
+  is recursive. *match* is #None for elements that contain no wildcards.
+  """
+
+  parts = pattern.split(sep)
+  index = 0
+  while index < len(parts) and not isglob(parts[index]):
+    index += 1
+  root = sep.join(parts[:index])
+  if index == 1:
+    root += sep
+
+  flags = 0 if is_case_sensitive else re.IGNORECASE
+  elements = []
+  for name in parts[index:]:
+    if isglob(name):
+      regex = fnmatch.translate(name)
+      if not include_dotfiles and not name.startswith('.'):
+        regex = r'(?!\.)' + regex
+      elements.append((name, re.compile(regex, flags).match))
+    else:
+      elements.append((name, None))
+
+  return root, tuple(elements), '**' in pattern
+
+
+def _glob(pattern, include_dotfiles=False):
+  """
+  Returns a list of the paths that match the normalized, absolute glob
+  *pattern*. Uses #os.scandir() for non-recursive patterns and falls back
+  to #glob2.glob() otherwise.
+  """
+
+  root, elements, is_recursive = _compile_glob(pattern, include_dotfiles)
+  if is_recursive:
+    if not glob2:
+      raise glob2_exc
+    return glob2.glob(pattern, include_hidden=include_dotfiles)
+
+  paths = [root]
+  check_exists = True
+  for name, match in elements:
+    if match is None:
+      paths = [join(path, name) for path in paths]
+      check_exists = True
+      continue
+    matches = []
+    for path in paths:
+      try:
+        with os.scandir(path) as it:
+          matches += [join(path, entry.name) for entry in it if match(entry.name)]
+      except OSError:
+        pass  # not a directory or does not exist
+    paths = matches
+    check_exists = False
+
+  if check_exists:
+    paths = [path for path in paths if os.path.lexists(path)]
+  return paths
+
+
 def addtobase(subject, base_suffix):
   """
   Adds the string *base_suffix* to the basename of *subject*.
@@ -328,17 +437,49 @@ def makedirs(path, exist_ok=True):
     raise
 
 
+_CHMOD_BITS = {
+  'r': (_stat.S_IRUSR, _stat.S_IRGRP, _stat.S_IROTH),
+  'w': (_stat.S_IWUSR, _stat.S_IWGRP, _stat.S_IWOTH),
+  'x': (_stat.S_IXUSR, _stat.S_IXGRP, _stat.S_IXOTH)
+}
+
+# Maps (target, permission) pairs to the respective bitmask.
+_CHMOD_MASKS = {}
+for _c, _masks in _CHMOD_BITS.items():
+  _CHMOD_MASKS.update(((t, _c), m) for t, m in zip('ugo', _masks))
+  _CHMOD_MASKS['a', _c] = functools.reduce(operator.or_, _masks)
+del _c, _masks
+
+# String representations of all combinations of access flags.
+_CHMOD_ORDER = (_stat.S_IRUSR, _stat.S_IWUSR, _stat.S_IXUSR,
+                _stat.S_IRGRP, _stat.S_IWGRP, _stat.S_IXGRP,
+                _stat.S_IROTH, _stat.S_IWOTH, _stat.S_IXOTH)
+_CHMOD_REPR = tuple(
+  ''.join('rwxrwxrwx'[i] if flags & x else '-' for i, x in enumerate(_CHMOD_ORDER))
+  for flags in range(0o1000))
+
+
 def chmod_update(flags, modstring):
   """
   Modifies *flags* according to *modstring*.
   """
 
-  mapping = {
-    'r': (_stat.S_IRUSR, _stat.S_IRGRP, _stat.S_IROTH),
-    'w': (_stat.S_IWUSR, _stat.S_IWGRP, _stat.S_IWOTH),
-    'x': (_stat.S_IXUSR, _stat.S_IXGRP, _stat.S_IXOTH)
-  }
+  for mask, add in _compile_modstring(modstring):
+    if add:
+      flags |= mask
+    else:
+      flags &= ~mask
+  return flags
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_modstring(modstring):
+  """
+  Parses *modstring* into a tuple of `(mask, add)` pairs that are applied
+  in order by #chmod_update().
+  """
 
+  result = []
   target, direction = 'a', None
   for c in modstring:
     if c in '+-':
@@ -348,19 +489,12 @@ def chmod_update(flags, modstring):
       target = c
       direction = None  # Need a - or + after group specifier.
       continue
-    if c in 'rwx' and direction in '+-':
-      if target == 'a':
-        mask = functools.reduce(operator.or_, mapping[c])
-      else:
-        mask = mapping[c]['ugo'.index(target)]
-      if direction == '-':
-        flags &= ~mask
-      else:
-        flags |= mask
+    if c in 'rwx' and direction is not None:
+      result.append((_CHMOD_MASKS[target, c], direction == '+'))
       continue
     raise ValueError('invalid chmod: {!r}'.format(modstring))
 
-  return flags
+  return tuple(result)
 
 
 def chmod_repr(flags):
@@ -368,12 +502,7 @@ def chmod_repr(flags):
   Returns a string representation of the access flags *flags*.
   """
 
-  template = 'rwxrwxrwx'
-  order = (_stat.S_IRUSR, _stat.S_IWUSR, _stat.S_IXUSR,
-           _stat.S_IRGRP, _stat.S_IWGRP, _stat.S_IXGRP,
-           _stat.S_IROTH, _stat.S_IWOTH, _stat.S_IXOTH)
-  return ''.join(template[i] if flags&x else '-'
-                 for i, x in enumerate(order))
+  return _CHMOD_REPR[flags & 0o777]
 
 
 def chmod(path, modstring):
@@ -389,14 +518,11 @@ def compare_timestamp(src, dst):
   """
 
   try:
-    dst_time = os.path.getmtime(dst)
-  except OSError as exc:
-    if exc.errno == errno.ENOENT:
-      return True  # dst does not exist
-    raise
+    dst_time = os.stat(dst).st_mtime
+  except FileNotFoundError:
+    return True  # dst does not exist
 
-  src_time = os.path.getmtime(src)
-  return src_time > dst_time
+  return os.stat(src).st_mtime > dst_time
 
 
 def compare_all_timestamps(srclist, dstlist):
@@ -412,37 +538,50 @@ def compare_all_timestamps(srclist, dstlist):
   min_dst = None
   for x in dstlist:
     try:
-      time = os.path.getmtime(x)
-    except OSError as exc:
-      if exc.errno == errno.ENOENT:
-        return True  # dst does not exist
-      raise
+      time = os.stat(x).st_mtime
+    except FileNotFoundError:
+      return True  # dst does not exist
     if min_dst is None or time < min_dst:
       min_dst = time
 
   if not srclist:
     return False  # dst exists with no sources
 
-  max_src = max(os.path.getmtime(x) for x in srclist)
-  return max_src > min_dst
+  for x in srclist:
+    if os.stat(x).st_mtime > min_dst:
+      return True
+  return False
 
 
 def fixcase(path):
   """
   Fixes the case of all path elements. On Windows, this uses the
-  `GetLongPathNameW()` API. On other platforms, it uses #os.listdir
+  `GetLongPathNameW()` API. On other platforms, it uses #os.scandir()
   to determine the proper case of the path elements.
+
+  Results for absolute paths (and directory listings) are cached. Use
+  #invalidate_fixcase_cache() after creating, renaming or removing files
+  that have already been passed to this function.
   """
 
+  if isabs(path):
+    return _fixcase_cached(path)
+  return _fixcase(path)
+
+
+def _fixcase(path):
   if os.name == 'nt':
     # Thanks to http://stackoverflow.com/a/3694799/791713
-    buf = ctypes.create_unicode_buffer(len(path) + 1)
-    GetLongPathNameW = ctypes.windll.kernel32.GetLongPathNameW
-    res = GetLongPathNameW(path, buf, len(path) + 1)
-    if res == 0 or res > 260:
+    # The first call returns the required buffer size including the
+    # terminating null character, the second call fills the buffer.
+    size = _GetLongPathNameW(path, None, 0)
+    if size == 0:
       return path
-    else:
-      return buf.value
+    buf = ctypes.create_unicode_buffer(size)
+    res = _GetLongPathNameW(path, buf, size)
+    if res == 0 or res >= size:
+      return path
+    return buf.value
   elif not is_case_sensitive and os.path.exists(path):
     is_path_abs = isabs(path)
     drive, path = splitdrive(path)
@@ -451,23 +590,57 @@ def fixcase(path):
     elif drive and drive.endswith(':'):
       drive += os.sep
     items = []
-    while path and path != '/':
-      path, element = split(path)
-      if not is_path_abs and not path:
-        current = '.'
-      else:
-        current = join(drive, path)
-      element_lc = element.lower()
-      for name in os.listdir(current):
-        if name.lower() == element_lc:
-          element = name
-          break
+    current = drive or cwd()
+    for element in path.split(sep):
+      if not element:
+        continue
+      if element not in (curdir, pardir):
+        key = element.lower()
+        name = _casemap(current).get(key)
+        if name is None:
+          # The path exists, thus the cached listing must be outdated.
+          name = _casemap(current, refresh=True).get(key, element)
+        element = name
       items.append(element)
-    items.reverse()
+      current = join(current, element)
     path = join(drive, *items)
   return path
 
 
+_fixcase_cached = functools.lru_cache(maxsize=4096)(_fixcase)
+
+
+# Maps absolute directory paths to the result of #_casemap().
+_casemaps = {}
+_casemaps_maxsize = 1024
+
+
+def _casemap(directory, refresh=False):
+  """
+  Returns a dictionary that maps the lowercase names of the entries in the
+  absolute *directory* to their actual names. The result is cached unless
+  *refresh* is #True. Used by #fixcase().
+  """
+
+  casemap = None if refresh else _casemaps.get(directory)
+  if casemap is None:
+    with os.scandir(directory) as it:
+      casemap = {entry.name.lower(): entry.name for entry in it}
+    if len(_casemaps) >= _casemaps_maxsize:
+      _casemaps.clear()
+    _casemaps[directory] = casemap
+  return casemap
+
+
+def invalidate_fixcase_cache():
+  """
+  Clears the cache of #fixcase() results and directory listings.
+  """
+
+  _fixcase_cached.cache_clear()
+  _casemaps.clear()
+
+
 def listdir(path, do_raise=True):
   """
   Like #os.listdir(), but if *do_raise* is #False, an empty list will be
@@ -485,6 +658,22 @@ def listdir(path, do_raise=True):
       raise
 
 
+def listdir_stat(path, do_raise=True):
+  """
+  Like #listdir(), but returns a list of `(name, stat_result)` tuples. The
+  information is retrieved with #os.scandir() which can avoid a separate
+  system call per entry on some platforms. Symbolic links are not followed.
+  """
+
+  try:
+    with os.scandir(path) as it:
+      return [(entry.name, entry.stat(follow_symlinks=False)) for entry in it]
+  except (OSError, IOError) as e:
+    if not do_raise and e.errno in (errno.ENOENT, errno.EPERM):
+      return []
+    raise
+
+
 # Backwards compatibility
 __all__ += ['get_long_path_name']
 get_long_path_name = fixcase
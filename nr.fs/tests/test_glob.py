@@ -0,0 +1,101 @@
+
+import contextlib
+import os
+import shutil
+import tempfile
+import unittest
+import nr.fs
+from nose.tools import *
+
+
+@contextlib.contextmanager
+def make_tree(*files):
+  root = tempfile.mkdtemp()
+  try:
+    for name in files:
+      path = os.path.join(root, *name.split('/'))
+      nr.fs.makedirs(os.path.dirname(path))
+      open(path, 'w').close()
+    yield root
+  finally:
+    shutil.rmtree(root)
+
+
+def glob(root, *args, **kwargs):
+  return sorted(os.path.relpath(x, root).replace(os.sep, '/')
+                for x in nr.fs.glob(*args, parent=root, **kwargs))
+
+
+def test_isglob():
+  assert_true(nr.fs.isglob('*.py'))
+  assert_true(nr.fs.isglob('file?.txt'))
+  assert_true(nr.fs.isglob('file[12].txt'))
+  assert_false(nr.fs.isglob('src/file.txt'))
+
+
+def test_literal():
+  with make_tree('a.txt', 'sub/b.txt') as root:
+    assert_equals(glob(root, ['a.txt', 'sub/b.txt', 'missing.txt']),
+                  ['a.txt', 'sub/b.txt'])
+    assert_equals(glob(root, 'a.txt'), ['a.txt'])
+
+
+@unittest.skipIf(not hasattr(os, 'symlink') or os.name == 'nt', 'requires symlinks')
+def test_dangling_symlink():
+  with make_tree('a.txt') as root:
+    os.symlink(os.path.join(root, 'missing'), os.path.join(root, 'link'))
+    assert_equals(glob(root, 'link'), ['link'])
+    assert_equals(glob(root, '*'), ['a.txt', 'link'])
+
+
+def test_wildcards():
+  with make_tree('a.py', 'b.py', 'c.txt', 'f1.txt', 'f2.txt', 'f3.txt') as root:
+    assert_equals(glob(root, '*.py'), ['a.py', 'b.py'])
+    assert_equals(glob(root, '?.txt'), ['c.txt'])
+    assert_equals(glob(root, 'f[12].txt'), ['f1.txt', 'f2.txt'])
+    assert_equals(glob(root, 'f[!12].txt'), ['f3.txt'])
+
+
+def test_intermediate_literal_elements():
+  with make_tree('a/x/b/1.py', 'a/y/b/2.py', 'a/y/c/3.py', 'a/z/b/4.txt', 'a/f') as root:
+    assert_equals(glob(root, 'a/*/b/*.py'), ['a/x/b/1.py', 'a/y/b/2.py'])
+    assert_equals(glob(root, '*/*/b'), ['a/x/b', 'a/y/b', 'a/z/b'])
+
+
+def test_include_dotfiles():
+  with make_tree('a.py', '.b.py', '.hidden/c.py', 'sub/d.py') as root:
+    assert_equals(glob(root, '*.py'), ['a.py'])
+    assert_equals(glob(root, '*.py', include_dotfiles=True), ['.b.py', 'a.py'])
+    assert_equals(glob(root, '.*.py'), ['.b.py'])
+    assert_equals(glob(root, '*/*.py'), ['sub/d.py'])
+    assert_equals(glob(root, '*/*.py', include_dotfiles=True),
+                  ['.hidden/c.py', 'sub/d.py'])
+
+
+def test_include_dotfiles_recursive():
+  try:
+    import glob2
+  except ImportError:
+    raise unittest.SkipTest('requires glob2')
+  with make_tree('a.py', '.b.py', '.hidden/c.py', 'sub/d.py') as root:
+    assert_equals(glob(root, '**/*.py'), ['a.py', 'sub/d.py'])
+    assert_equals(glob(root, '**/*.py', include_dotfiles=True),
+                  ['.b.py', '.hidden/c.py', 'a.py', 'sub/d.py'])
+
+
+def test_root_pattern():
+  root = os.path.abspath(os.sep)
+  expected = sorted(os.path.join(root, x) for x in os.listdir(root)
+                    if not x.startswith('.'))
+  assert_equals(sorted(nr.fs.glob(os.path.join(root, '*'))), expected)
+
+
+def test_excludes():
+  with make_tree('a.py', 'b.py', 'c.txt', 'f1.txt', 'f[1].txt') as root:
+    assert_equals(glob(root, '*', excludes=['*.py']), ['c.txt', 'f1.txt', 'f[1].txt'])
+    assert_equals(glob(root, '*', excludes=['a.py', 'c.txt']), ['b.py', 'f1.txt', 'f[1].txt'])
+    assert_equals(glob(root, '*.txt', excludes=['f[1].txt']), ['c.txt', 'f1.txt'])
+    assert_equals(glob(root, '*.py', excludes=['f[0-9].txt'], ignore_false_excludes=True),
+                  ['a.py', 'b.py'])
+    with assert_raises(ValueError):
+      glob(root, '*.py', excludes=['c.txt'])
@@ -35,6 +35,8 @@ import types
 
 class _Member(object):
 
+  __slots__ = ('interface', 'name')
+
   def __init__(self, interface, name):
     self.interface = interface
     self.name = name
@@ -54,6 +56,8 @@ class _Member(object):
 
 class Method(_Member):
 
+  __slots__ = ('impl', 'final')
+
   def __init__(self, interface, name, impl=None, final=False):
     super(Method, self).__init__(interface, name)
     self.impl = impl
@@ -84,6 +88,8 @@ class Attribute(_Member):
   constructed.
   """
 
+  __slots__ = ('type',)
+
   def __init__(self, interface, name, type=None):
     super(Attribute, self).__init__(interface, name)
     self.type = type
@@ -95,6 +101,9 @@ class Property(_Member):
   implementations for the getter, setter and deleter independently.
   """
 
+  __slots__ = ('getter_impl', 'setter_impl', 'deleter_impl', 'getter_final',
+               'setter_final', 'deleter_final')
+
   def __init__(self, interface, name, getter_impl=None, setter_impl=NotImplemented,
                deleter_impl=NotImplemented, getter_final=False, setter_final=False,
                deleter_final=False):
@@ -176,6 +185,35 @@ class Property(_Member):
       setter_final, deleter_final)
 
 
+def _bind_member(interface, name, value):
+  if not value.is_bound:
+    value.interface = interface
+    value.name = name
+
+
+def _convert_method(interface, name, value):
+  if Method.is_candidate(name, value):
+    impl = value if getattr(value, '__is_default__', False) else None
+    final = getattr(value, '__is_final__', False)
+    setattr(interface, name, Method(interface, name, impl, final))
+
+
+def _convert_property(interface, name, value):
+  prop = Property.from_python_property(interface, name, value)
+  setattr(interface, name, prop)
+
+
+# Handlers for the members of an #Interface declaration, looked up by the
+# exact type of the member. Subclasses are resolved with #isinstance().
+_member_handlers = {
+  Method: _bind_member,
+  Attribute: _bind_member,
+  Property: _bind_member,
+  types.FunctionType: _convert_method,
+  property: _convert_property,
+}
+
+
 class Interface(nr.types.InlineMetaclassBase):
   """
   Base class for interfaces. Interfaces can not be instantiated. They are
@@ -189,16 +227,32 @@ class Interface(nr.types.InlineMetaclassBase):
     # Convert function declarations in the class to Method objects and
     # bind Attribute objects to the new interface class.
     for key, value in vars(self).items():
-      if isinstance(value, _Member) and not value.is_bound:
-        value.interface = self
-        value.name = key
-      elif Method.is_candidate(key, value):
-        impl = value if getattr(value, '__is_default__', False) else None
-        final = getattr(value, '__is_final__', False)
-        setattr(self, key, Method(self, key, impl, final))
-      elif Property.is_candidate(key, value):
-        prop = Property.from_python_property(self, key, value)
-        setattr(self, key, prop)
+      handler = _member_handlers.get(type(value))
+      if handler is None:
+        if isinstance(value, _Member):
+          handler = _bind_member
+        elif isinstance(value, types.FunctionType):
+          handler = _convert_method
+        elif isinstance(value, property):
+          handler = _convert_property
+        else:
+          continue
+      handler(self, key, value)
+
+    # Collect the members once, they are looked up for every implementation.
+    members = {}
+    seen = set()
+    for klass in self.__mro__:
+      for key, value in vars(klass).items():
+        if key in seen:
+          continue
+        seen.add(key)
+        if isinstance(value, _Member):
+          members[key] = value
+    self._interface_members = tuple(members.values())
+    self._interface_member_names = frozenset(
+      k for k, v in members.items()
+      if isinstance(v, (Method, Attribute)) and not _is_private_name(k))
 
     return self
 
@@ -219,28 +273,23 @@ def is_interface(obj):
 
 def members_of(interface):
   """
-  Returns a generator that yields all members of the specified interface.
-  Basically, that is all member functions of the interface.
+  Returns a tuple of all members of the specified interface. Basically,
+  that is all member functions of the interface.
   """
 
   if not is_interface(interface):
     raise TypeError('expected Interface subclass')
 
-  for name in dir(interface):
-    value = getattr(interface, name)
-    if isinstance(value, _Member):
-      yield value
+  return interface._interface_members
 
 
 def has_member(interface, member):
-  if (member.startswith('_') and not member.endswith('_')) or \
-      member in ('__new__', '__init__'):
-    return False
-  try:
-    value = getattr(interface, member)
-  except AttributeError:
-    return False
-  return isinstance(value, (Method, Attribute))
+  return member in interface._interface_member_names
+
+
+def _is_private_name(name):
+  return (name.startswith('_') and not name.endswith('_')) or \
+      name in ('__new__', '__init__')
 
 
 def get_conflicting_members(a, b):
@@ -400,17 +449,16 @@ class Implementation(nr.types.InlineMetaclassBase):
 
     # Check member functions for whether they have been marked with
     # the @override decorator.
-    for key, value in vars(self).items():
-      if not isinstance(value, types.FunctionType):
-        continue
-      if not getattr(value, '__is_override__', False):
-        continue
-      for interface in implements:
-        if has_member(interface, key):
-          break
-      else:
-        raise RuntimeError("'{}' does not override a method of any of the "
-          "implemented interfaces.".format(key))
+    overrides = [key for key, value in vars(self).items()
+                 if isinstance(value, types.FunctionType)
+                 and getattr(value, '__is_override__', False)]
+    if overrides:
+      member_names = frozenset().union(
+        *(x._interface_member_names for x in implements))
+      for key in overrides:
+        if key not in member_names:
+          raise RuntimeError("'{}' does not override a method of any of the "
+            "implemented interfaces.".format(key))
 
     # The implementation is created successfully, add it to the
     # implementations set of all interfaces and their parents.
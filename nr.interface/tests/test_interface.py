@@ -87,3 +87,24 @@ def test_conflict():
   with assert_raises(nr.interface.ConflictingInterfacesError):
     class Test(nr.interface.Implementation):
       nr.interface.implements(AFinalInterface, BFinalInterface)
+
+
+def test_override():
+  class Greeter(nr.interface.Interface):
+    def greet(self):
+      pass
+
+  class Test(nr.interface.Implementation):
+    nr.interface.implements(Greeter)
+    @nr.interface.override
+    def greet(self):
+      pass
+
+  with assert_raises(RuntimeError):
+    class Test(nr.interface.Implementation):
+      nr.interface.implements(Greeter)
+      def greet(self):
+        pass
+      @nr.interface.override
+      def wave(self):
+        pass
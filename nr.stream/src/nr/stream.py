@@ -21,17 +21,50 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+"""
+Streaming iterators made easy in Python.
+
+# Performance notes
+
+The per-item work of the #stream methods should reduce to the C
+implementations in #itertools, #operator, #collections.deque and the
+`map()`/`filter()` builtins wherever possible. Numba is not a suitable
+accelerator for this module: the streams contain arbitrary Python objects
+and are built from generators, both of which Numba handles poorly.
+"""
+
 __author__ = 'Niklas Rosenstein <rosensteinniklas@gmail.com>'
 __version__ = '1.0.3'
 
 
+import abc
+import collections
 import functools
 import itertools
+import operator
+import types
 
 try:
-  range = xrange
-except NameError:
-  pass
+  from itertools import batched as _batched
+except ImportError:
+  def _batched(iterable, n):
+    if n < 1:
+      raise ValueError('n must be at least one')
+    return _batched_iter(iter(iterable), n)
+
+  def _batched_iter(iterable, n):
+    while True:
+      chunk = tuple(itertools.islice(iterable, n))
+      if not chunk:
+        return
+      yield chunk
+
+
+_missing = object()
+
+
+def _call(x):
+  return x()
 
 
 class _dualmethod(object):
@@ -47,9 +80,10 @@ class _dualmethod(object):
 
   def __get__(self, instance, owner):
     assert owner is not None
+    method = types.MethodType(self.func, owner)
     if instance is not None:
-      return functools.partial(self.func, owner, instance)
-    return functools.partial(self.func, owner)
+      method = types.MethodType(method, instance)
+    return method
 
 
 class stream(object):
@@ -58,11 +92,13 @@ class stream(object):
   this module in an object-oriented interface.
   """
 
+  __slots__ = ('iterable', '__weakref__')
+
   def __init__(self, iterable):
     self.iterable = iter(iterable)
 
   def __iter__(self):
-    return iter(self.iterable)
+    return self.iterable
 
   def __next__(self):
     return next(self.iterable)
@@ -79,6 +115,8 @@ class stream(object):
     Calls every item in *iterable* with the specified arguments.
     """
 
+    if not a and not kw:
+      return cls(map(_call, iterable))
     return cls(x(*a, **kw) for x in iterable)
 
   @_dualmethod
@@ -87,6 +125,8 @@ class stream(object):
     Iterable-first replacement of Python's built-in `map()` function.
     """
 
+    if not a and not kw:
+      return cls(map(func, iterable))
     return cls(func(x, *a, **kw) for x in iterable)
 
   @_dualmethod
@@ -95,6 +135,8 @@ class stream(object):
     Iterable-first replacement of Python's built-in `filter()` function.
     """
 
+    if not a and not kw:
+      return cls(filter(cond, iterable))
     return cls(x for x in iterable if cond(x, *a, **kw))
 
   @_dualmethod
@@ -103,24 +145,31 @@ class stream(object):
     Yields unique items from *iterable* whilst preserving the original order.
     """
 
-    if key is None:
-      key = lambda x: x
     def generator():
       seen = set()
       seen_add = seen.add
-      for item in iterable:
-        key_val = key(item)
-        if key_val not in seen:
-          seen_add(key_val)
-          yield item
+      if key is None:
+        for item in iterable:
+          if item not in seen:
+            seen_add(item)
+            yield item
+      else:
+        for item in iterable:
+          key_val = key(item)
+          if key_val not in seen:
+            seen_add(key_val)
+            yield item
     return cls(generator())
 
   @_dualmethod
-  def chunks(cls, iterable, n, fill=None):
+  def chunks(cls, iterable, n, fill=None, pad=True):
     """
-    Collects elements in fixed-length chunks.
+    Collects elements in fixed-length chunks. If *pad* is #True, the last
+    chunk is padded with *fill*, otherwise it may be shorter than *n*.
     """
 
+    if not pad:
+      return cls(_batched(iterable, n))
     return cls(itertools.zip_longest(*[iter(iterable)] * n, fillvalue=fill))
 
   @_dualmethod
@@ -129,11 +178,7 @@ class stream(object):
     Similar to #itertools.chain.from_iterable().
     """
 
-    def generator():
-      for it in iterables:
-        for element in it:
-          yield element
-    return cls(generator())
+    return cls(itertools.chain.from_iterable(iterables))
 
   @_dualmethod
   def chain(cls, *iterables):
@@ -141,11 +186,7 @@ class stream(object):
     Similar to #itertools.chain.from_iterable().
     """
 
-    def generator():
-      for it in iterables:
-        for element in it:
-          yield element
-    return cls(generator())
+    return cls(itertools.chain.from_iterable(iterables))
 
   @_dualmethod
   def attr(cls, iterable, attr_name):
@@ -153,7 +194,7 @@ class stream(object):
     Applies #getattr() on all elements of *iterable*.
     """
 
-    return cls(getattr(x, attr_name) for x in iterable)
+    return cls(map(operator.attrgetter(attr_name), iterable))
 
   @_dualmethod
   def item(cls, iterable, key):
@@ -161,7 +202,37 @@ class stream(object):
     Applies `__getitem__` on all elements of *iterable*.
     """
 
-    return cls(x[key] for x in iterable)
+    return cls(map(operator.itemgetter(key), iterable))
+
+  @_dualmethod
+  def call_attr(cls, iterable, attr_name, *a, **kw):
+    """
+    Calls the method *attr_name* on all elements of *iterable* with the
+    specified arguments. Shortcut for `.attr(attr_name).call(*a, **kw)`.
+    """
+
+    return cls(map(operator.methodcaller(attr_name, *a, **kw), iterable))
+
+  @_dualmethod
+  def filter_attr(cls, iterable, attr_name, pred):
+    """
+    Filters elements of *iterable* whose attribute *attr_name* satisfies
+    *pred*. Unlike `.attr(attr_name).filter(pred)`, the elements themselves
+    are yielded.
+    """
+
+    getter = operator.attrgetter(attr_name)
+    return cls(x for x in iterable if pred(getter(x)))
+
+  @_dualmethod
+  def filter_item(cls, iterable, key, pred):
+    """
+    Filters elements of *iterable* whose item *key* satisfies *pred*. Unlike
+    `.item(key).filter(pred)`, the elements themselves are yielded.
+    """
+
+    getter = operator.itemgetter(key)
+    return cls(x for x in iterable if pred(getter(x)))
 
   @_dualmethod
   def of_type(cls, iterable, types):
@@ -169,16 +240,37 @@ class stream(object):
     Filters using #isinstance().
     """
 
+    if type(types) in (type, abc.ABCMeta):
+      # The #__instancecheck__() of these metaclasses gives the same result
+      # as #isinstance(), and binding it avoids a generator frame per item.
+      pred = functools.partial(type(types).__instancecheck__, types)
+      return cls(filter(pred, iterable))
     return cls(x for x in iterable if isinstance(x, types))
 
   @_dualmethod
-  def partition(cls, iterable, pred):
+  def partition(cls, iterable, pred, lazy=False):
     """
-    Use a predicate to partition items into false and true entries.
+    Use a predicate to partition items into false and true entries. Returns
+    a tuple of two streams.
+
+    The items are sorted into two lists in a single pass. If *lazy* is
+    #True, the streams are instead evaluated on demand using
+    #itertools.tee(), which buffers items that were consumed by one stream
+    but not yet by the other.
     """
 
-    t1, t2 = itertools.tee(iterable)
-    return cls(itertools.filterfalse(pred, t1), filter(pred, t2))
+    if lazy:
+      t1, t2 = itertools.tee(iterable)
+      return cls(itertools.filterfalse(pred, t1)), cls(filter(pred, t2))
+
+    trues, falses = [], []
+    true_append, false_append = trues.append, falses.append
+    for item in iterable:
+      if pred(item):
+        true_append(item)
+      else:
+        false_append(item)
+    return cls(falses), cls(trues)
 
   @_dualmethod
   def dropwhile(cls, iterable, pred):
@@ -197,8 +289,18 @@ class stream(object):
     return cls(itertools.islice(iterable, *args, **kwargs))
 
   @_dualmethod
-  def first(cls, iterable):
-    return next(iter(iterable))
+  def first(cls, iterable, default=_missing):
+    """
+    Returns the first item of *iterable*. If the iterable is empty,
+    *default* is returned or a #ValueError is raised if it is not specified.
+    """
+
+    item = next(iter(iterable), _missing)
+    if item is _missing:
+      if default is _missing:
+        raise ValueError('first() of empty iterable')
+      return default
+    return item
 
   @_dualmethod
   def length(cls, iterable):
@@ -206,30 +308,16 @@ class stream(object):
     Returns the number of items in an iterable.
     """
 
-    iterable = iter(iterable)
-    count = 0
-    while True:
-      try:
-        next(iterable)
-      except StopIteration:
-        break
-      count += 1
-    return count
+    counter = itertools.count()
+    collections.deque(zip(iterable, counter), maxlen=0)
+    return next(counter)
 
   count = length  # deprecated
 
   @_dualmethod
   def consume(cls, iterable, n=None):
     if n is not None:
-      for _ in range(n):
-        try:
-          next(iterable)
-        except StopIteration:
-          break
+      collections.deque(itertools.islice(iterable, n), maxlen=0)
     else:
-      while True:
-        try:
-          next(iterable)
-        except StopIteration:
-          break
+      collections.deque(iterable, maxlen=0)
     return iterable
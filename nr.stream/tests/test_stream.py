@@ -0,0 +1,53 @@
+
+import collections
+import itertools
+from nr.stream import stream
+from nose.tools import *
+
+
+def test_partition():
+  odds, evens = stream.partition(range(6), lambda x: x % 2 == 0)
+  assert_equals(list(odds), [1, 3, 5])
+  assert_equals(list(evens), [0, 2, 4])
+
+
+def test_partition_lazy():
+  odds, evens = stream.partition(itertools.count(), lambda x: x % 2 == 0, lazy=True)
+  assert_equals(list(itertools.islice(evens, 3)), [0, 2, 4])
+  assert_equals(list(itertools.islice(odds, 3)), [1, 3, 5])
+
+
+def test_first():
+  assert_equals(stream.first([3, 4]), 3)
+  assert_equals(stream.first(iter([3, 4])), 3)
+  assert_equals(stream.first([], None), None)
+  assert_equals(stream.first([], default=42), 42)
+  with assert_raises(ValueError):
+    stream.first([])
+
+
+def test_chunks():
+  assert_equals(list(stream.chunks(range(5), 2)), [(0, 1), (2, 3), (4, None)])
+  assert_equals(list(stream.chunks(range(5), 2, fill=0)), [(0, 1), (2, 3), (4, 0)])
+  assert_equals(list(stream.chunks(range(5), 2, pad=False)), [(0, 1), (2, 3), (4,)])
+  assert_equals(list(stream.chunks(range(4), 2, pad=False)), [(0, 1), (2, 3)])
+  with assert_raises(ValueError):
+    stream.chunks(range(5), 0, pad=False)
+
+
+def test_call_attr():
+  assert_equals(list(stream.call_attr(['a b', 'c'], 'split', ' ')),
+                [['a', 'b'], ['c']])
+
+
+def test_filter_attr():
+  Point = collections.namedtuple('Point', 'x y')
+  points = [Point(0, 1), Point(1, 2), Point(2, 3)]
+  assert_equals(list(stream.filter_attr(points, 'x', lambda x: x > 0)),
+                points[1:])
+
+
+def test_filter_item():
+  items = [{'a': 1}, {'a': 2}, {'a': 3}]
+  assert_equals(list(stream.filter_item(items, 'a', lambda x: x % 2)),
+                [{'a': 1}, {'a': 3}])